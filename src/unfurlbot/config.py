@@ -3,8 +3,10 @@
 from __future__ import annotations
 
 from datetime import timedelta
+from functools import cached_property
+from urllib.parse import urlparse
 
-from pydantic import Field, RedisDsn, SecretStr, field_validator
+from pydantic import Field, SecretStr, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from safir.kafka import KafkaConnectionSettings
 from safir.logging import LogLevel, Profile
@@ -17,7 +19,9 @@ class Config(BaseSettings):
     """Configuration for unfurlbot."""
 
     model_config = SettingsConfigDict(
-        env_prefix="UNFURLBOT_", case_sensitive=False
+        env_prefix="UNFURLBOT_",
+        case_sensitive=False,
+        frozen=True,
     )
 
     name: str = Field("unfurlbot", title="Name of application")
@@ -45,11 +49,13 @@ class Config(BaseSettings):
         title="Kafka connection configuration.",
     )
 
-    redis_url: RedisDsn = Field(
-        default_factory=lambda: RedisDsn(
-            "redis://localhost:6379/0",
+    redis_url: str = Field(
+        "redis://localhost:6379/0",
+        description=(
+            "URL for the redis instance, used for caching. The scheme can be "
+            "``redis``, ``rediss``, or ``unix`` (for a Unix domain socket)."
         ),
-        description=("URL for the redis instance, used for caching."),
+        examples=["redis://localhost:6379/0", "unix:///run/redis.sock?db=0"],
     )
 
     slack_token: SecretStr = Field(title="Slack bot token")
@@ -111,6 +117,16 @@ class Config(BaseSettings):
         examples=["60s"],
     )
 
+    jira_max_concurrency: int = Field(
+        16,
+        title="Jira request concurrency",
+        description=(
+            "The maximum number of concurrent requests to the Jira Data "
+            "Proxy, across all messages being processed."
+        ),
+        ge=1,
+    )
+
     gafaelfawr_token: SecretStr = Field(
         ...,
         title="Gafaelfawr token",
@@ -180,24 +196,63 @@ class Config(BaseSettings):
         description=("Kafka topic name for `interaction` Slack events"),
     )
 
-    @property
+    @cached_property
+    def message_topics(self) -> tuple[str, ...]:
+        """The Kafka topics carrying Slack message events that are scanned
+        for tokens to unfurl.
+        """
+        return (
+            self.message_channels_topic,
+            self.message_groups_topic,
+            self.message_im_topic,
+            self.message_mpim_topic,
+        )
+
+    @cached_property
     def jira_proxy_url(self) -> str:
         """The URL to the Jira Data Proxy."""
-        env_url = self.environment_url.rstrip("/")
-        proxy_path = self.jira_proxy_path.lstrip("/")
-        return f"{env_url}/{proxy_path}"
+        return f"{self.environment_url}{self.jira_proxy_path}"
 
-    @property
-    def parsed_jira_projects(self) -> list[str]:
-        """The Jira projects to recognize."""
-        return list({p.strip() for p in self.jira_projects.split(",")})
+    @cached_property
+    def parsed_jira_projects(self) -> tuple[str, ...]:
+        """The Jira projects to recognize, sorted and without duplicates.
 
-    @field_validator("jira_root_url")
+        This is parsed once from `jira_projects` and cached since it is
+        consulted for every Slack message. Empty entries, such as from a
+        trailing comma, are ignored.
+        """
+        projects = {p.strip() for p in self.jira_projects.split(",")}
+        projects.discard("")
+        return tuple(sorted(projects))
+
+    @field_validator("redis_url")
+    @classmethod
+    def validate_redis_url(cls, value: str) -> str:
+        """Ensure that the Redis URL has a scheme supported by redis-py."""
+        scheme = urlparse(value).scheme
+        if scheme not in {"redis", "rediss", "unix"}:
+            raise ValueError(
+                f"Redis URL scheme must be redis, rediss, or unix, not "
+                f"{scheme!r}"
+            )
+        return value
+
+    @field_validator("environment_url", "jira_root_url")
     @classmethod
     def ensure_no_trailing_slash(cls, value: str) -> str:
-        """Ensure that the Jira url does not have a trailing slash."""
+        """Ensure that the environment and Jira URLs do not have a trailing
+        slash.
+        """
         return value.rstrip("/")
 
+    @field_validator("jira_proxy_path")
+    @classmethod
+    def ensure_single_leading_slash(cls, value: str) -> str:
+        """Ensure that the Jira Data Proxy path has exactly one leading
+        slash.
+        """
+        return "/" + value.lstrip("/")
+
 
 config = Config()
 """Configuration for unfurlbot."""
@@ -11,6 +11,9 @@ from structlog.stdlib import BoundLogger
 
 from ..factory import Factory, ProcessContext
 
+_logger = get_logger(__name__)
+"""Base logger for consumers, bound with per-message context."""
+
 
 @dataclass(slots=True, kw_only=True)
 class ConsumerContext:
@@ -61,13 +64,13 @@ class ConsumerContextDependency:
             record = record[0]
 
         # Add the Kafka context to the logger
-        logger = get_logger(__name__)  # eventually use a logger dependency
-        kafka_context = {
-            "topic": record.topic,
-            "offset": record.offset,
-            "partition": record.partition,
-        }
-        logger = logger.bind(kafka=kafka_context)
+        logger = _logger.bind(
+            kafka={
+                "topic": record.topic,
+                "offset": record.offset,
+                "partition": record.partition,
+            }
+        )
 
         return ConsumerContext(
             logger=logger,
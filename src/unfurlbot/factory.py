@@ -3,7 +3,7 @@
 from dataclasses import dataclass
 from typing import Self
 
-from httpx import AsyncClient
+from httpx import AsyncClient, Limits
 from redis.asyncio import Redis
 from structlog.stdlib import BoundLogger
 
@@ -28,13 +28,47 @@ class ProcessContext:
     redis: Redis
     """Shared Redis client."""
 
+    jira_client: JiraIssueClient
+    """Shared Jira client, which holds no per-message state."""
+
+    unfurl_event_store: SlackUnfurlEventStore
+    """Shared store of Slack unfurl events, which holds no per-message
+    state.
+    """
+
     @classmethod
     async def create(cls) -> Self:
         """Create a new process context."""
-        http_client = AsyncClient()
-        redis = Redis.from_url(str(config.redis_url))
+        # The client is shared by all unfurlers and mostly talks to two
+        # hosts (Slack and the Jira Data Proxy), so keep more connections
+        # alive, and for longer, than the httpx defaults.
+        http_client = AsyncClient(
+            limits=Limits(
+                max_connections=128,
+                max_keepalive_connections=64,
+                keepalive_expiry=60,
+            )
+        )
+        redis = Redis.from_url(
+            config.redis_url,
+            socket_keepalive=True,
+            health_check_interval=30,
+        )
+
+        jira_client = JiraIssueClient(
+            proxy_url=config.jira_proxy_url,
+            http_client=http_client,
+            token=config.gafaelfawr_token.get_secret_value(),
+            max_concurrency=config.jira_max_concurrency,
+        )
+        unfurl_event_store = SlackUnfurlEventStore(redis=redis)
 
-        return cls(http_client=http_client, redis=redis)
+        return cls(
+            http_client=http_client,
+            redis=redis,
+            jira_client=jira_client,
+            unfurl_event_store=unfurl_event_store,
+        )
 
     async def aclose(self) -> None:
         """Close any resources held by the context."""
@@ -86,13 +120,9 @@ class Factory:
         )
 
     def get_jira_client(self) -> JiraIssueClient:
-        """Get a Jira client."""
-        return JiraIssueClient(
-            proxy_url=config.jira_proxy_url,
-            http_client=self._process_context.http_client,
-            token=config.gafaelfawr_token.get_secret_value(),
-        )
+        """Get the process-wide Jira client."""
+        return self._process_context.jira_client
 
     def get_slack_unfurl_event_store(self) -> SlackUnfurlEventStore:
-        """Get a Slack unfurl event store."""
-        return SlackUnfurlEventStore(redis=self._process_context.redis)
+        """Get the process-wide Slack unfurl event store."""
+        return self._process_context.unfurl_event_store
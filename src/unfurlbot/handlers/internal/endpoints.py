@@ -5,6 +5,8 @@ or other information that should not be visible outside the Kubernetes cluster.
 These handlers aren't externally visible.
 """
 
+from functools import cache
+
 from fastapi import APIRouter
 from safir.metadata import Metadata, get_metadata
 
@@ -28,6 +30,17 @@ internal_router = APIRouter()
     summary="Application metadata",
 )
 async def get_index() -> Metadata:
+    return _get_metadata()
+
+
+@cache
+def _get_metadata() -> Metadata:
+    """Get the application metadata.
+
+    The metadata is read from the installed package and can't change while
+    the application runs, so it is only read on the first request. This route
+    is hit frequently by Kubernetes health checks.
+    """
     return get_metadata(
         package_name="unfurlbot",
         application_name=config.name,
@@ -22,10 +22,7 @@ kafka_router = KafkaRouter(
 
 
 @kafka_router.subscriber(
-    config.message_channels_topic,
-    config.message_groups_topic,
-    config.message_im_topic,
-    config.message_mpim_topic,
+    *config.message_topics,
     group_id=config.consumer_group_id,
 )
 async def handle_slack_message(
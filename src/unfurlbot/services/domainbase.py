@@ -2,11 +2,13 @@
 
 from __future__ import annotations
 
+import asyncio
+import time
 from abc import ABC, abstractmethod
-from datetime import UTC, datetime
 from typing import ClassVar
 
 from httpx import AsyncClient
+from pydantic_core import from_json, to_json
 from rubin.squarebot.models.kafka import SquarebotSlackMessageValue
 from structlog.stdlib import BoundLogger
 
@@ -44,6 +46,17 @@ class DomainUnfurler(ABC):
 
     unfurler_domain: ClassVar[str] = "default"
 
+    max_concurrent_tokens: ClassVar[int] = 8
+    """The maximum number of tokens from a single Slack message that are
+    unfurled concurrently.
+    """
+
+    thread_extraction_length: ClassVar[int] = 4096
+    """Messages with text longer than this number of characters have their
+    tokens extracted in a worker thread so that long messages (such as pasted
+    logs) don't block the event loop.
+    """
+
     def __init__(
         self,
         *,
@@ -56,36 +69,138 @@ class DomainUnfurler(ABC):
             token_type=self.unfurler_domain
         )
         self._unfurl_event_store = unfurl_event_store
+        self._slack_token = config.slack_token.get_secret_value()
+        self._slack_headers = {
+            "content-type": "application/json; charset=utf-8",
+            "authorization": f"Bearer {self._slack_token}",
+        }
 
     async def process_slack(self, message: SquarebotSlackMessageValue) -> None:
-        """Process a Slack message and unfurl extracted tokens."""
-        tokens = await self.extract_tokens(message)
-        for token in tokens:
-            # This is a logger bound to the specific token context
-            token_logger = self._logger.bind(
-                token=token,
-                channel=message.channel,
-                thread_ts=message.thread_ts,
-                trigger_ts=message.ts,
+        """Process a Slack message and unfurl extracted tokens.
+
+        Tokens are independent of each other, so their unfurl messages are
+        created concurrently (up to `max_concurrent_tokens` at a time). The
+        unfurls are then sent in the order the tokens were mentioned. A
+        failure to unfurl one token is logged and doesn't prevent the others
+        from being unfurled.
+        """
+        if len(message.text) > self.thread_extraction_length:
+            tokens = await asyncio.to_thread(self.extract_tokens, message)
+        else:
+            tokens = self.extract_tokens(message)
+        if not tokens:
+            return
+
+        # This is a logger bound to the message context, which is shared by
+        # all the tokens in the message
+        message_logger = self._logger.bind(
+            channel=message.channel,
+            thread_ts=message.thread_ts,
+            trigger_ts=message.ts,
+        )
+
+        # Staleness only depends on the message, so check it once before
+        # going to Redis
+        if self._is_trigger_message_stale(message):
+            message_logger.warning(
+                "Ignoring stale trigger message", tokens=tokens
             )
-            if self._is_trigger_message_stale(message):
-                token_logger.warning("Ignoring stale trigger message")
-                continue
-            if await self._is_recently_unfurled(message, token):
-                token_logger.debug("Ignoring recently unfurled token")
-                continue
-            unfurl_slack_message = await self.create_slack_message(
-                token=token, trigger_message=message, logger=token_logger
+            return
+
+        new_tokens = await self._drop_recently_unfurled(
+            message, tokens, message_logger
+        )
+        if not new_tokens:
+            return
+
+        semaphore = asyncio.Semaphore(self.max_concurrent_tokens)
+        results = await asyncio.gather(
+            *(
+                self._create_unfurl(
+                    token=token,
+                    message=message,
+                    semaphore=semaphore,
+                    logger=message_logger.bind(token=token),
+                )
+                for token in new_tokens
+            ),
+            return_exceptions=True,
+        )
+        # Cancellation and other non-Exception errors aren't swallowed
+        for result in results:
+            if isinstance(result, BaseException) and not isinstance(
+                result, Exception
+            ):
+                raise result
+
+        # Send the unfurls one at a time so that they appear in the thread in
+        # the order the tokens were mentioned
+        for token, result in zip(new_tokens, results, strict=True):
+            await self._send_created_unfurl(
+                token=token, result=result, logger=message_logger
             )
-            await self._send_unfurl(
-                message=unfurl_slack_message, token=token, logger=token_logger
+
+    async def _create_unfurl(
+        self,
+        *,
+        token: str,
+        message: SquarebotSlackMessageValue,
+        semaphore: asyncio.Semaphore,
+        logger: BoundLogger,
+    ) -> SlackBlockKitMessage:
+        """Create the unfurl message for a single token from a Slack message.
+
+        Parameters
+        ----------
+        token
+            The token to unfurl.
+        message
+            The Slack message that the token was extracted from.
+        semaphore
+            Semaphore limiting the number of tokens from the message that
+            are unfurled concurrently.
+        logger
+            A logger bound with the token and message context.
+        """
+        async with semaphore:
+            return await self.create_slack_message(
+                token=token, trigger_message=message, logger=logger
             )
 
+    async def _send_created_unfurl(
+        self,
+        *,
+        token: str,
+        result: SlackBlockKitMessage | BaseException,
+        logger: BoundLogger,
+    ) -> None:
+        """Send the unfurl created for a token, logging any failure.
+
+        Parameters
+        ----------
+        token
+            The token that was unfurled.
+        result
+            The unfurl message created for the token, or the exception raised
+            while creating it.
+        logger
+            A logger bound with the message context.
+        """
+        logger = logger.bind(token=token)
+        if isinstance(result, BaseException):
+            logger.error("Failed to unfurl token", exc_info=result)
+            return
+        try:
+            await self._send_unfurl(message=result, token=token, logger=logger)
+        except Exception:
+            logger.exception("Failed to unfurl token")
+
     @abstractmethod
-    async def extract_tokens(
-        self, message: SquarebotSlackMessageValue
-    ) -> list[str]:
-        """Extract tokens from a Slack message."""
+    def extract_tokens(self, message: SquarebotSlackMessageValue) -> list[str]:
+        """Extract tokens from a Slack message.
+
+        This is synchronous since extraction only inspects the message text.
+        """
         raise NotImplementedError
 
     @abstractmethod
@@ -127,19 +242,15 @@ class DomainUnfurler(ABC):
             A logger bound with the token and message context.
         """
         # https://api.slack.com/methods/chat.postMessage
+        # The token is only sent in the authorization header so that the
+        # body never contains it and can be safely logged.
         body = message.to_slack()
-        body["token"] = config.slack_token.get_secret_value()
         r = await self._http_client.post(
             "https://slack.com/api/chat.postMessage",
-            json=body,
-            headers={
-                "content-type": "application/json; charset=utf-8",
-                "authorization": (
-                    f"Bearer {config.slack_token.get_secret_value()}"
-                ),
-            },
+            content=to_json(body),
+            headers=self._slack_headers,
         )
-        resp_json = r.json()
+        resp_json = from_json(r.content)
         if resp_json["ok"]:
             logger.info(
                 "Sent unfurl",
@@ -152,7 +263,7 @@ class DomainUnfurler(ABC):
                 "Failed to send Slack message",
                 response=resp_json,
                 status_code=r.status_code,
-                reply_message=body.pop("token"),
+                reply_message=body,
                 channel=message.channel,
                 thread_ts=message.thread_ts,
                 token=token,
@@ -167,17 +278,27 @@ class DomainUnfurler(ABC):
                 token=token,
             )
 
-    async def _is_recently_unfurled(
+    async def _drop_recently_unfurled(
         self,
         message: SquarebotSlackMessageValue,
-        token: str,
-    ) -> bool:
-        """Check if a message has been recently unfurled."""
-        return await self._unfurl_event_store.has_event(
+        tokens: list[str],
+        logger: BoundLogger,
+    ) -> list[str]:
+        """Drop the tokens that have been recently unfurled in the message's
+        channel and thread, using a single Redis round trip.
+        """
+        recently_unfurled = await self._unfurl_event_store.has_events(
             channel=message.channel,
             thread_ts=message.thread_ts,
-            token=token,
+            tokens=tokens,
         )
+        new_tokens = []
+        for token in tokens:
+            if recently_unfurled[token]:
+                logger.debug("Ignoring recently unfurled token", token=token)
+            else:
+                new_tokens.append(token)
+        return new_tokens
 
     def _is_trigger_message_stale(
         self,
@@ -200,6 +321,6 @@ class DomainUnfurler(ABC):
         current, within a time window defined by
         `Config.slack_trigger_message_ttl`.
         """
-        trigger_datetime = datetime.fromtimestamp(float(message.ts), tz=UTC)
-        age = datetime.now(tz=UTC) - trigger_datetime
-        return age.total_seconds() > config.slack_trigger_message_ttl
+        # Slack timestamps are Unix epoch seconds, so compare them directly
+        age = time.time() - float(message.ts)
+        return age > config.slack_trigger_message_ttl
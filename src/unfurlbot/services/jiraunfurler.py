@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import re
+from functools import cache, lru_cache
 
 from httpx import AsyncClient
 from rubin.squarebot.models.kafka import SquarebotSlackMessageValue
@@ -11,6 +12,7 @@ from structlog.stdlib import BoundLogger
 from ..config import config
 from ..storage.jiraissues import JiraIssueClient, JiraIssueSummary
 from ..storage.slackmessage import (
+    SlackBaseBlock,
     SlackBlockKitMessage,
     SlackContextBlock,
     SlackTextObject,
@@ -19,6 +21,217 @@ from ..storage.slackmessage import (
 from ..storage.unfurleventstore import SlackUnfurlEventStore
 from .domainbase import DomainUnfurler
 
+_FENCED_CODE_PATTERN = re.compile(r"```.*?```", flags=re.DOTALL)
+"""Pattern matching markdown fenced code blocks."""
+
+_INLINE_CODE_PATTERN = re.compile(r"`.*?`")
+"""Pattern matching markdown inline code."""
+
+_MAX_CACHED_TEXT_LENGTH = 4096
+"""Messages with text longer than this number of characters aren't cached by
+`_scan_issue_keys_cached`, so that the cache can't hold on to many long
+pasted logs.
+"""
+
+
+def extract_issue_keys(
+    text: str, *, jira_root_url: str, projects: tuple[str, ...]
+) -> list[str]:
+    """Extract Jira issue keys from the text of a Slack message.
+
+    Issue keys in markdown code (fenced or inline) and in URLs are ignored,
+    except for the keys of Jira issue URLs.
+
+    Parameters
+    ----------
+    text
+        The text content of the Slack message.
+    jira_root_url
+        The root URL of the Jira server, without a trailing slash.
+    projects
+        The keys of the Jira projects to recognize.
+
+    Returns
+    -------
+    list
+        The unique issue keys found in the text, in order of first mention.
+        For example, ``["DM-123", "DM-456"]``.
+    """
+    # Most messages don't mention any project, and a substring search
+    # for each prefix is far cheaper than a scan. This also keeps those
+    # messages out of the scan cache.
+    if not any(prefix in text for prefix in _get_key_prefixes(projects)):
+        return []
+    # Without URLs there's nothing for the scan to skip, so only look for
+    # issue keys.
+    if "://" in text:
+        pattern = _get_scan_pattern(jira_root_url, projects)
+    else:
+        pattern = _get_key_pattern(projects)
+    if len(text) > _MAX_CACHED_TEXT_LENGTH:
+        return list(_scan_issue_keys(text, pattern))
+    return list(_scan_issue_keys_cached(text, pattern))
+
+
+@cache
+def _get_key_prefixes(projects: tuple[str, ...]) -> tuple[str, ...]:
+    """Get the prefixes that every issue key of the projects starts with."""
+    return tuple(f"{project}-" for project in projects)
+
+
+@cache
+def _get_key_pattern(projects: tuple[str, ...]) -> re.Pattern[str]:
+    """Get the compiled pattern that matches only issue keys.
+
+    This is equivalent to the pattern from `_get_scan_pattern` for text that
+    contains no URLs.
+
+    Parameters
+    ----------
+    projects
+        The keys of the Jira projects to recognize.
+
+    Returns
+    -------
+    re.Pattern
+        A pattern matching an issue key, such as ``DM-1234``, in the ``key``
+        group. Longer project names are tried first so that a project whose
+        name is a prefix of another (such as ``TSS`` and ``TSSPP``) doesn't
+        cause backtracking.
+    """
+    alternatives = "|".join(
+        re.escape(p) for p in sorted(projects, key=len, reverse=True)
+    )
+    return re.compile(rf"(?P<key>\b(?:{alternatives})-\d+)")
+
+
+@cache
+def _get_scan_pattern(
+    jira_root_url: str, projects: tuple[str, ...]
+) -> re.Pattern[str]:
+    """Get the compiled pattern that scans Slack text for Jira issue keys.
+
+    Parameters
+    ----------
+    jira_root_url
+        The root URL of the Jira server, without a trailing slash.
+    projects
+        The keys of the Jira projects to recognize.
+
+    Returns
+    -------
+    re.Pattern
+        A pattern whose alternatives match, in priority order, the prefix of
+        a Jira issue URL, any other URL, and finally an issue key in the
+        ``key`` group. Scanning the text with `re.Pattern.finditer` consumes
+        URLs whole so that only issue keys outside them (or directly
+        following a Jira issue URL prefix) are matched in the ``key`` group.
+        Markdown code must be removed from the text before it is scanned.
+    """
+    return re.compile(
+        rf"(?P<jira>{re.escape(jira_root_url)}/browse/)"
+        r"|(?P<url>https?://\S+)"
+        rf"|{_get_key_pattern(projects).pattern}"
+    )
+
+
+def _scan_issue_keys(
+    text: str, scan_pattern: re.Pattern[str]
+) -> tuple[str, ...]:
+    """Scan Slack text for Jira issue keys.
+
+    Parameters
+    ----------
+    text
+        The text content of the Slack message.
+    scan_pattern
+        The pattern from `_get_scan_pattern` or `_get_key_pattern`.
+
+    Returns
+    -------
+    tuple
+        The unique issue keys found in the text, in order of first mention.
+    """
+    # This algorithm is based on the original sqrbot implementation. Fenced
+    # code blocks are removed before inline code so that a stray backtick
+    # can't pair up with the opening backtick of a fence. The scan then
+    # skips over URLs rather than removing them.
+    if "`" in text:
+        text = _FENCED_CODE_PATTERN.sub("", text)
+        text = _INLINE_CODE_PATTERN.sub("", text)
+
+    # A dict deduplicates repeated mentions while keeping mention order
+    keys = dict.fromkeys(
+        key
+        for match in scan_pattern.finditer(text)
+        if (key := match.group("key"))
+    )
+    return tuple(keys)
+
+
+_scan_issue_keys_cached = lru_cache(maxsize=1024)(_scan_issue_keys)
+"""Cached `_scan_issue_keys`, for messages up to `_MAX_CACHED_TEXT_LENGTH`
+characters long. Slack redelivers the same text for retries, edits, and
+thread broadcasts.
+"""
+
+
+@lru_cache(maxsize=1024)
+def _format_issue_blocks(
+    issue: JiraIssueSummary,
+) -> tuple[str, tuple[SlackBaseBlock, ...]]:
+    """Format the fallback text and Slack blocks describing a Jira issue.
+
+    These don't depend on the channel or thread being replied to, so they're
+    cached for when the same issue is unfurled in several places at once.
+    The blocks are immutable, so they can be shared between messages.
+
+    Parameters
+    ----------
+    issue
+        The issue to describe.
+
+    Returns
+    -------
+    tuple
+        The notification fallback text and the message blocks.
+    """
+    # Text that's used for notifications
+    fallback_text = f"{issue.key} ({issue.status_label}) {issue.summary}"
+
+    # The main section block
+    main_block = SlackTextSectionBlock(
+        text=(f"<{issue.homepage}|*{issue.key}*> {issue.summary}"),
+        fields=[],
+    )
+
+    # Prepare a context block with the assignee, status, and date
+    assignee = issue.assignee_name or "Unassigned"
+    # The date is either the resolved date or the created date
+    if issue.date_resolved:
+        date = issue.date_resolved
+        ts_label = "Resolved"
+    else:
+        date = issue.date_created
+        ts_label = "Created"
+    ts = int(date.timestamp())
+    date_fallback = date.date().isoformat()  # YYYY-MM-DD
+    # Use Slack date formatting to make the date human-readable and
+    # be localized to the user's timezone
+    date_text = (
+        f"<!date^{ts}^{ts_label} {{date_pretty}} {{time}}"
+        f"|{ts_label} {date_fallback}>"
+    )
+
+    context_block = SlackContextBlock(
+        elements=[
+            SlackTextObject(
+                text=f"{assignee} | {issue.status_label} | {date_text}",
+            ),
+        ],
+    )
+    return fallback_text, (main_block, context_block)
+
 
 class JiraUnfurler(DomainUnfurler):
     """Unfurls Jira issue keys found in Slack messages."""
@@ -40,10 +253,9 @@ class JiraUnfurler(DomainUnfurler):
         )
         self._jira_client = jira_client
         self._jira_host = config.jira_root_url
+        self._jira_projects = config.parsed_jira_projects
 
-    async def extract_tokens(
-        self, message: SquarebotSlackMessageValue
-    ) -> list[str]:
+    def extract_tokens(self, message: SquarebotSlackMessageValue) -> list[str]:
         """Extract Jira issue tokens from a Slack message.
 
         Implements the abstract method from the base class.
@@ -58,9 +270,9 @@ class JiraUnfurler(DomainUnfurler):
         list
             A list of Jira issue tokens found in the message text.
         """
-        return await self._extract_issues(message.text)
+        return self._extract_issues(message.text)
 
-    async def _extract_issues(self, text: str) -> list[str]:
+    def _extract_issues(self, text: str) -> list[str]:
         """Extract issue keys from a Slack message.
 
         Parameters
@@ -71,38 +283,13 @@ class JiraUnfurler(DomainUnfurler):
         Returns
         -------
         list
-            A list of issue keys (`str` type) found in the message. For
-            example, ``["DM-123", "DM-456"]``. The list is empty if no issue
-            keys are found.
+            A list of issue keys (`str` type) found in the message, in order
+            of first mention. For example, ``["DM-123", "DM-456"]``. The list
+            is empty if no issue keys are found.
         """
-        # This algorithm is based on the original sqrbot implementation
-
-        # Remove markdown fenced code blocks from the text
-        text = re.sub(r"```.*?```", "", text, flags=re.DOTALL)
-
-        # Remove inline code from the text
-        text = re.sub(r"`.*?`", "", text)
-
-        # Protect issue keys in Jira URLs by removing the surrounding URL
-        text = re.sub(rf"{self._jira_host}/browse/", "", text)
-
-        # Protect "tickets/DM-" (only) when not part of a URL or path
-        text = re.sub(r"tickets/DM-", "DM-", text)
-
-        # Remove URLs from the text
-        text = re.sub(r"https?://\S+", "", text)
-
-        projects = await self._get_projects()
-        key_pattern = rf"\b((?:{'|'.join(projects)})-\d+)"
-        matches = re.findall(key_pattern, text)
-        matches = list({str(m) for m in matches})  # Deduplicate
-        return sorted(matches)
-
-    async def _get_projects(self) -> list[str]:
-        """Get a list of Jira projects."""
-        # This is a shim for an API-driven approach to getting the list of
-        # projects in the Rubin Jira.
-        return config.parsed_jira_projects
+        return extract_issue_keys(
+            text, jira_root_url=self._jira_host, projects=self._jira_projects
+        )
 
     async def create_slack_message(
         self,
@@ -162,43 +349,10 @@ class JiraUnfurler(DomainUnfurler):
             the ``thread_id`` or the original message. If the original message
             was more threaded, this is ``None``.
         """
-        # Text that's used for notifications
-        fallback_text = f"{issue.key} ({issue.status_label}) {issue.summary}"
-
-        # The main section block
-        main_block = SlackTextSectionBlock(
-            text=(f"<{issue.homepage}|*{issue.key}*> {issue.summary}"),
-            fields=[],
-        )
-
-        # Prepare a context block with the assignee, status, and date
-        assignee = issue.assignee_name or "Unassigned"
-        # The date is either the resolved date or the created date
-        if issue.date_resolved:
-            ts = int(issue.date_resolved.timestamp())
-            ts_label = "Resolved"
-            date_fallback = issue.date_resolved.strftime("%Y-%m-%d")
-        else:
-            ts = int(issue.date_created.timestamp())
-            ts_label = "Created"
-            date_fallback = issue.date_created.strftime("%Y-%m-%d")
-        # Use Slack date formatting to make the date human-readable and
-        # be localized to the user's timezone
-        date_text = (
-            f"<!date^{ts}^{ts_label} {{date_pretty}} {{time}}"
-            f"|{ts_label} {date_fallback}>"
-        )
-
-        context_block = SlackContextBlock(
-            elements=[
-                SlackTextObject(
-                    text=f"{assignee} | {issue.status_label} | {date_text}",
-                ),
-            ],
-        )
+        fallback_text, blocks = _format_issue_blocks(issue)
         return SlackBlockKitMessage(
             text=fallback_text,
-            blocks=[main_block, context_block],
+            blocks=list(blocks),
             channel=channel,
             thread_ts=thread_ts,
         )
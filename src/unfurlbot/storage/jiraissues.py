@@ -2,15 +2,30 @@
 
 from __future__ import annotations
 
-from datetime import datetime
-from typing import Annotated, Any, Self
+import asyncio
+from collections import OrderedDict
+from datetime import UTC, datetime
+from typing import Annotated, Any, ClassVar
 
 from httpx import AsyncClient
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+from pydantic_core import from_json
 from safir.pydantic import normalize_datetime
 
 from ..config import config
 
+_ISSUE_FIELDS = (
+    "summary,status,created,updated,resolutiondate,description,reporter,"
+    "assignee"
+)
+"""The issue fields requested from Jira. Other fields, such as comments, can
+be much larger.
+
+These are the fields used by `JiraIssueSummary`, plus ``updated``, which
+`JiraIssueClient.get_issue` uses to tell whether a previously parsed summary
+can be reused.
+"""
+
 
 class JiraIssueClient:
     """Client for fetching Jira issues.
@@ -24,6 +39,15 @@ class JiraIssueClient:
         The HTTP client to use for requests.
     token : str
         The Gafaelfawr token to use for authentication.
+    max_concurrency : int
+        The maximum number of requests to have in flight at once. The client
+        is shared by all messages being processed, so this limits the load on
+        Jira regardless of how many tokens are being unfurled concurrently.
+    """
+
+    issue_cache_size: ClassVar[int] = 1024
+    """The maximum number of parsed issues to keep for reuse while they are
+    unchanged in Jira.
     """
 
     def __init__(
@@ -32,10 +56,15 @@ class JiraIssueClient:
         proxy_url: str,
         http_client: AsyncClient,
         token: str,
+        max_concurrency: int,
     ) -> None:
         self._proxy_base = proxy_url
         self._http_client = http_client
-        self._token = token
+        self._headers = {"Authorization": f"Bearer {token}"}
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._issue_cache: OrderedDict[tuple[str, str], JiraIssueSummary] = (
+            OrderedDict()
+        )
 
     async def get(self, path: str) -> dict:
         """Send a GET request to the Jira API.
@@ -47,24 +76,43 @@ class JiraIssueClient:
             leading slash, as well as the API version prefix (e.g.,
             `/rest/api/latest` or `/rest/api/v2`).
         """
-        response = await self._http_client.get(
-            f"{self._proxy_base}{path}",
-            headers={"Authorization": f"Bearer {self._token}"},
-            timeout=config.jira_timeout.total_seconds(),
-        )
+        async with self._semaphore:
+            response = await self._http_client.get(
+                f"{self._proxy_base}{path}",
+                headers=self._headers,
+                timeout=config.jira_timeout.total_seconds(),
+            )
         response.raise_for_status()  # add a proper error message
-        return response.json()
+        return from_json(response.content)
 
     async def get_issue(self, issue_key: str) -> JiraIssueSummary:
-        """Get a Jira issue."""
-        path = f"/rest/api/2/issue/{issue_key}"
+        """Get a Jira issue.
+
+        The issue is always fetched from Jira, but if it hasn't been updated
+        since it was last fetched, the previously parsed summary is reused.
+        """
+        path = f"/rest/api/2/issue/{issue_key}?fields={_ISSUE_FIELDS}"
         data = await self.get(path)
-        return JiraIssueSummary.from_json(data)
+        updated = data["fields"].get("updated")
+        if not updated:
+            return JiraIssueSummary.from_json(data)
+
+        cache_key = (data["key"], updated)
+        if issue := self._issue_cache.get(cache_key):
+            self._issue_cache.move_to_end(cache_key)
+            return issue
+        issue = JiraIssueSummary.from_json(data)
+        self._issue_cache[cache_key] = issue
+        if len(self._issue_cache) > self.issue_cache_size:
+            self._issue_cache.popitem(last=False)
+        return issue
 
 
 class JiraIssueSummary(BaseModel):
     """Summary of a Jira issue."""
 
+    model_config = ConfigDict(frozen=True)
+
     key: Annotated[str, Field(description="The issue key.")]
 
     summary: Annotated[str, Field(description="The issue summary.")]
@@ -113,32 +161,41 @@ class JiraIssueSummary(BaseModel):
     )(normalize_datetime)
 
     @classmethod
-    def from_json(cls, data: dict[str, Any]) -> Self:
+    def from_json(cls, data: dict[str, Any]) -> JiraIssueSummary:
         """Create a JiraIssueSummary from JSON data."""
-        date_created = datetime.fromisoformat(data["fields"]["created"])
-
-        if data["fields"]["resolutiondate"]:
-            date_resolved = datetime.fromisoformat(
-                data["fields"]["resolutiondate"],
-            )
+        fields = data["fields"]
+        if fields["resolutiondate"]:
+            date_resolved = _parse_jira_datetime(fields["resolutiondate"])
         else:
             date_resolved = None
 
-        if data["fields"]["assignee"]:
-            assignee_name = data["fields"]["assignee"]["displayName"]
+        if fields["assignee"]:
+            assignee_name = fields["assignee"]["displayName"]
         else:
             assignee_name = None
 
-        homepage = f"{config.jira_root_url}/browse/{data['key']}"
-
-        return cls(
+        # The Jira API response is trusted, so skip validation. Dates are
+        # normalized to UTC here rather than by _normalize_dates.
+        return cls.model_construct(
             key=data["key"],
-            summary=data["fields"]["summary"],
-            status_label=data["fields"]["status"]["name"],
-            date_created=date_created,
-            description=data["fields"]["description"],
-            reporter_name=data["fields"]["reporter"]["displayName"],
+            summary=fields["summary"],
+            status_label=fields["status"]["name"],
+            date_created=_parse_jira_datetime(fields["created"]),
+            description=fields["description"],
+            reporter_name=fields["reporter"]["displayName"],
             date_resolved=date_resolved,
             assignee_name=assignee_name,
-            homepage=homepage,
+            homepage=f"{config.jira_root_url}/browse/{data['key']}",
         )
+
+
+def _parse_jira_datetime(value: str) -> datetime:
+    """Parse a Jira API timestamp, such as ``2024-02-13T16:23:06.000+0000``.
+
+    Unlike ``normalize_datetime``, this doesn't go through Pydantic's
+    validator machinery, which `JiraIssueSummary.from_json` skips.
+    """
+    date = datetime.fromisoformat(value)
+    if date.tzinfo is None:
+        return date.replace(tzinfo=UTC)
+    return date.astimezone(UTC)
@@ -5,7 +5,7 @@ from __future__ import annotations
 from abc import ABCMeta, abstractmethod
 from typing import Annotated, Any
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class SlackTextObject(BaseModel):
@@ -14,6 +14,8 @@ class SlackTextObject(BaseModel):
     https://api.slack.com/reference/messaging/composition-objects#text
     """
 
+    model_config = ConfigDict(frozen=True)
+
     text: Annotated[str, Field(description="The text content of the block.")]
 
     type: Annotated[str, Field(description="The type of text object.")] = (
@@ -42,6 +44,8 @@ class SlackTextObject(BaseModel):
 class SlackBaseBlock(BaseModel, metaclass=ABCMeta):
     """Base class for any Slack Block Kit block."""
 
+    model_config = ConfigDict(frozen=True)
+
     @abstractmethod
     def to_slack(self) -> dict[str, Any]:
         """Convert to a Slack Block Kit block.
@@ -78,8 +82,12 @@ class SlackTextSectionBlock(SlackBaseBlock):
             A Slack Block Kit block suitable for including in the ``fields``
             or ``text`` section of a ``blocks`` element.
         """
-        text = SlackTextObject(text=self.text, type=self.format)
-        payload: dict[str, Any] = {"type": "section", "text": text.to_slack()}
+        # Build the text object directly rather than through a transient
+        # SlackTextObject, which would be validated only to be serialized.
+        text: dict[str, Any] = {"type": self.format, "text": self.text}
+        if self.format == "mrkdwn":
+            text["verbatim"] = False
+        payload: dict[str, Any] = {"type": "section", "text": text}
         if self.fields:
             payload["fields"] = [
                 field.to_slack(max_length=2000) for field in self.fields
@@ -162,18 +170,22 @@ class SlackBlockKitMessage(BaseModel):
         payload: dict[str, Any] = {
             "text": _format_and_truncate_at_end(self.text, 3000),
             "mrkdwn": self.mrkdwn,
-            "blocks": [],
+            "blocks": [block.to_slack() for block in self.blocks],
         }
         if self.thread_ts:
             payload["thread_ts"] = self.thread_ts
         if self.channel:
             payload["channel"] = self.channel
+        return payload
 
-        for block in self.blocks:
-            block_payload = block.to_slack()
-            payload["blocks"].append(block_payload)
 
-        return payload
+_SLACK_ESCAPES = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;"})
+"""Translation table escaping the characters that Slack treats as control
+characters in message text.
+"""
+
+_TRUNCATION_MARKER = " [...]"
+"""Marker appended to text that was truncated to fit Slack's limits."""
 
 
 def _format_and_truncate_at_end(string: str, max_length: int) -> str:
@@ -196,17 +208,12 @@ def _format_and_truncate_at_end(string: str, max_length: int) -> str:
     str
         The truncated string with special characters escaped.
     """
-    string = (
-        string.strip()
-        .replace("&", "&amp;")
-        .replace("<", "&lt;")
-        .replace(">", "&gt;")
-    )
+    string = string.strip().translate(_SLACK_ESCAPES)
     if len(string) <= max_length:
         return string
-    truncated = " [...]"
-    last_newline = string.rfind("\n", 0, max_length - len(truncated))
+    cutoff = max_length - len(_TRUNCATION_MARKER)
+    last_newline = string.rfind("\n", 0, cutoff)
     if last_newline == -1:
-        return string[: max_length - len(truncated)] + truncated
+        return string[:cutoff] + _TRUNCATION_MARKER
     else:
-        return string[:last_newline] + truncated
+        return string[:last_newline] + _TRUNCATION_MARKER
@@ -21,33 +21,36 @@ class SlackUnfurlEventModel(BaseModel):
     ]
 
 
-class SlackUnfurlEventKey:
-    """A key for a Slack unfurl event."""
-
-    def __init__(
-        self,
-        channel: str,
-        token: str,
-        thread_ts: str | None = None,
-    ) -> None:
-        self.channel = channel
-        self.token = token
-        self.thread_ts = thread_ts
-
-    def __str__(self) -> str:
-        # base64 encode the token to avoid issues with special characters
-        token = self.token.encode("utf-8").hex()
-        key = f"unfurl:slack:{self.channel}:{token}"
-        if self.thread_ts:
-            key += f":{self.thread_ts}"
-        return key
+def _format_event_key(channel: str, token: str, thread_ts: str | None) -> str:
+    """Format the Redis key of a Slack unfurl event."""
+    # Tokens such as Jira issue keys are used as-is. Others are hex encoded
+    # to avoid issues with special characters, with a "%" prefix (which
+    # can't appear in a raw token) so the two forms never collide.
+    if token.isascii() and token.replace("-", "").isalnum():
+        encoded_token = token
+    else:
+        encoded_token = "%" + token.encode("utf-8").hex()
+    key = f"unfurl:slack:{channel}:{encoded_token}"
+    if thread_ts:
+        key += f":{thread_ts}"
+    return key
 
 
 class SlackUnfurlEventStore(PydanticRedisStorage[SlackUnfurlEventModel]):
-    """A Redis storage backend of Slack unfurl events."""
-
-    def __init__(self, redis: Redis) -> None:
-        super().__init__(redis=redis, datatype=SlackUnfurlEventModel)
+    """A Redis storage backend of Slack unfurl events.
+
+    Parameters
+    ----------
+    redis
+        The Redis client.
+    key_prefix
+        A prefix prepended to every Redis key, as in `PydanticRedisStorage`.
+    """
+
+    def __init__(self, redis: Redis, key_prefix: str = "") -> None:
+        super().__init__(
+            redis=redis, datatype=SlackUnfurlEventModel, key_prefix=key_prefix
+        )
 
     async def add_event(
         self,
@@ -55,26 +58,44 @@ class SlackUnfurlEventStore(PydanticRedisStorage[SlackUnfurlEventModel]):
         token: str,
         thread_ts: str | None = None,
     ) -> None:
-        key = SlackUnfurlEventKey(
-            channel=channel,
-            token=token,
-            thread_ts=thread_ts,
-        )
+        key = _format_event_key(channel, token, thread_ts)
         await self.store(
-            str(key),
+            key,
             SlackUnfurlEventModel(time=datetime.now(tz=UTC)),
             lifetime=config.slack_debounce_time,
         )
 
-    async def has_event(
+    async def has_events(
         self,
         channel: str,
-        token: str,
+        tokens: list[str],
         thread_ts: str | None = None,
-    ) -> bool:
-        key = SlackUnfurlEventKey(
-            channel=channel,
-            token=token,
-            thread_ts=thread_ts,
-        )
-        return await self.get(str(key)) is not None
+    ) -> dict[str, bool]:
+        """Check whether each of several tokens has a recent unfurl event.
+
+        The checks are pipelined so that only one round trip to Redis is
+        made regardless of the number of tokens.
+
+        Parameters
+        ----------
+        channel
+            The ID of the Slack channel.
+        tokens
+            The tokens to check.
+        thread_ts
+            The timestamp of the thread, if the unfurls are in a thread.
+
+        Returns
+        -------
+        dict
+            Mapping of each token to whether it has a recent unfurl event.
+        """
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for token in tokens:
+                key = _format_event_key(channel, token, thread_ts)
+                pipe.exists(self._prefix_key(key))
+            results = await pipe.execute()
+        return {
+            token: bool(result)
+            for token, result in zip(tokens, results, strict=True)
+        }
@@ -0,0 +1,61 @@
+"""Tests for the application configuration."""
+
+from __future__ import annotations
+
+import pytest
+from pydantic import ValidationError
+
+from unfurlbot.config import Config
+
+
+@pytest.mark.parametrize(
+    "redis_url",
+    [
+        "redis://localhost:6379/0",
+        "rediss://redis.example.com:6380/1",
+        "unix:///run/redis.sock?db=0",
+    ],
+)
+def test_redis_url(redis_url: str) -> None:
+    """Test that the Redis URL schemes supported by redis-py are accepted."""
+    assert Config(redis_url=redis_url).redis_url == redis_url
+
+
+@pytest.mark.parametrize(
+    "redis_url", ["localhost:6379", "/run/redis.sock", "http://localhost/"]
+)
+def test_redis_url_invalid(redis_url: str) -> None:
+    """Test that Redis URLs without a supported scheme are rejected."""
+    with pytest.raises(ValidationError):
+        Config(redis_url=redis_url)
+
+
+def test_environment_url_trailing_slash() -> None:
+    """Test that a trailing slash is removed from the environment URL."""
+    config = Config(environment_url="https://example.com/")
+    assert config.environment_url == "https://example.com"
+    assert config.jira_proxy_url == "https://example.com/jira-data-proxy"
+
+
+@pytest.mark.parametrize(
+    "jira_proxy_path",
+    ["/jira-data-proxy", "jira-data-proxy", "//jira-data-proxy"],
+)
+def test_jira_proxy_url(jira_proxy_path: str) -> None:
+    """Test that the Jira proxy URL is joined with exactly one slash."""
+    config = Config(
+        environment_url="https://example.com/",
+        jira_proxy_path=jira_proxy_path,
+    )
+    assert config.jira_proxy_path == "/jira-data-proxy"
+    assert config.jira_proxy_url == "https://example.com/jira-data-proxy"
+
+
+def test_default_validation() -> None:
+    """Test that default values are normalized like explicit ones."""
+
+    class DefaultPathConfig(Config):
+        jira_proxy_path: str = "jira-data-proxy"
+
+    config = DefaultPathConfig(environment_url="https://example.com")
+    assert config.jira_proxy_url == "https://example.com/jira-data-proxy"
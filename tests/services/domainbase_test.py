@@ -0,0 +1,189 @@
+"""Tests for the DomainUnfurler base class."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+
+import pytest
+from httpx import AsyncClient, MockTransport, Request, Response
+from redis.asyncio import Redis
+from rubin.squarebot.models.kafka import SquarebotSlackMessageValue
+from rubin.squarebot.models.slack import SlackChannelType, SlackMessageType
+from structlog import get_logger
+from structlog.stdlib import BoundLogger
+
+from unfurlbot.services.domainbase import DomainUnfurler
+from unfurlbot.storage.slackmessage import SlackBlockKitMessage
+from unfurlbot.storage.unfurleventstore import SlackUnfurlEventStore
+
+
+class MockEventStore(SlackUnfurlEventStore):
+    """Unfurl event store that keeps events in memory."""
+
+    def __init__(self) -> None:
+        # The Redis client connects lazily, so it's never used here
+        super().__init__(redis=Redis())
+        self.events: list[str] = []
+        self.lookups = 0
+
+    async def add_event(
+        self, channel: str, token: str, thread_ts: str | None = None
+    ) -> None:
+        self.events.append(token)
+
+    async def has_events(
+        self, channel: str, tokens: list[str], thread_ts: str | None = None
+    ) -> dict[str, bool]:
+        self.lookups += 1
+        return {token: token in self.events for token in tokens}
+
+
+class MockUnfurler(DomainUnfurler):
+    """Unfurler that treats each word of a message as a token.
+
+    The ``FAIL`` token raises an exception, the ``CANCEL`` token is
+    cancelled, and the ``SLOW`` token takes longer than the others. The
+    unfurler tracks how many tokens it creates messages for at once.
+    """
+
+    unfurler_domain = "mock"
+
+    def __init__(
+        self,
+        *,
+        http_client: AsyncClient,
+        logger: BoundLogger,
+        unfurl_event_store: SlackUnfurlEventStore,
+    ) -> None:
+        super().__init__(
+            http_client=http_client,
+            logger=logger,
+            unfurl_event_store=unfurl_event_store,
+        )
+        self.active = 0
+        self.max_active = 0
+
+    def extract_tokens(self, message: SquarebotSlackMessageValue) -> list[str]:
+        return message.text.split()
+
+    async def create_slack_message(
+        self,
+        *,
+        token: str,
+        trigger_message: SquarebotSlackMessageValue,
+        logger: BoundLogger,
+    ) -> SlackBlockKitMessage:
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            # Let the other tokens run
+            await asyncio.sleep(0.05 if token == "SLOW" else 0.01)
+        finally:
+            self.active -= 1
+        if token == "FAIL":
+            raise ValueError("Can't unfurl this token")
+        if token == "CANCEL":
+            raise asyncio.CancelledError
+        return SlackBlockKitMessage(
+            text=token,
+            blocks=[],
+            channel=trigger_message.channel,
+            thread_ts=trigger_message.ts,
+        )
+
+
+def _make_message(text: str, *, age: float = 0) -> SquarebotSlackMessageValue:
+    return SquarebotSlackMessageValue(
+        type=SlackMessageType.message,
+        channel="C123",
+        channel_type=SlackChannelType.channel,
+        user="U123",
+        ts=f"{time.time() - age:.6f}",
+        text=text,
+        slack_event="{}",
+    )
+
+
+async def _process(
+    message: SquarebotSlackMessageValue,
+    event_store: MockEventStore,
+    unfurler_class: type[MockUnfurler] = MockUnfurler,
+) -> tuple[list[str], MockUnfurler]:
+    """Process a message with a mock unfurler, returning the tokens that
+    were sent to Slack and the unfurler.
+    """
+    sent: list[str] = []
+
+    def handler(request: Request) -> Response:
+        sent.append(json.loads(request.content)["text"])
+        return Response(200, json={"ok": True})
+
+    async with AsyncClient(transport=MockTransport(handler)) as http_client:
+        unfurler = unfurler_class(
+            http_client=http_client,
+            logger=get_logger("unfurlbot"),
+            unfurl_event_store=event_store,
+        )
+        await unfurler.process_slack(message)
+    return sent, unfurler
+
+
+@pytest.mark.asyncio
+async def test_stale_message() -> None:
+    """Test that stale messages are ignored without checking Redis."""
+    event_store = MockEventStore()
+    sent, _ = await _process(_make_message("A B", age=3600), event_store)
+    assert sent == []
+    assert event_store.lookups == 0
+
+
+@pytest.mark.asyncio
+async def test_recently_unfurled() -> None:
+    """Test that recently unfurled tokens aren't unfurled again."""
+    event_store = MockEventStore()
+    event_store.events.append("A")
+    sent, _ = await _process(_make_message("A B"), event_store)
+    assert sent == ["B"]
+    assert event_store.events == ["A", "B"]
+
+
+@pytest.mark.asyncio
+async def test_failed_token() -> None:
+    """Test that a token that fails to unfurl doesn't stop the others."""
+    event_store = MockEventStore()
+    sent, _ = await _process(_make_message("A FAIL B"), event_store)
+    assert sent == ["A", "B"]
+    assert event_store.events == ["A", "B"]
+
+
+@pytest.mark.asyncio
+async def test_unfurl_order() -> None:
+    """Test that unfurls are sent in mention order, even if a token that was
+    mentioned earlier takes longer to unfurl.
+    """
+    sent, _ = await _process(_make_message("SLOW A B"), MockEventStore())
+    assert sent == ["SLOW", "A", "B"]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_token() -> None:
+    """Test that cancellation of a token isn't swallowed."""
+    with pytest.raises(asyncio.CancelledError):
+        await _process(_make_message("A CANCEL B"), MockEventStore())
+
+
+@pytest.mark.asyncio
+async def test_concurrency_limit() -> None:
+    """Test that tokens are unfurled concurrently, up to the limit."""
+
+    class LimitedUnfurler(MockUnfurler):
+        max_concurrent_tokens = 2
+
+    tokens = [f"T{i}" for i in range(6)]
+    sent, unfurler = await _process(
+        _make_message(" ".join(tokens)), MockEventStore(), LimitedUnfurler
+    )
+    assert sent == tokens
+    assert unfurler.max_active == 2
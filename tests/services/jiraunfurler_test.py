@@ -2,24 +2,32 @@
 
 from __future__ import annotations
 
+import json
+from pathlib import Path
+from typing import Any
+
 import pytest
+from httpx import AsyncClient
+from redis.asyncio import Redis
 from structlog import get_logger
 
-from unfurlbot.factory import Factory, ProcessContext
+from unfurlbot.services.jiraunfurler import JiraUnfurler, extract_issue_keys
+from unfurlbot.storage.jiraissues import JiraIssueClient, JiraIssueSummary
+from unfurlbot.storage.unfurleventstore import SlackUnfurlEventStore
 
 
-@pytest.mark.asyncio
-async def test_key_extraction() -> None:
-    """Test that issue keys are extracted from Slack messages."""
-    process_contact = await ProcessContext.create()
-    factory = Factory(
-        logger=get_logger("unfurlbot"),
-        process_context=process_contact,
+def _extract(text: str) -> list[str]:
+    return extract_issue_keys(
+        text,
+        jira_root_url="https://jira.lsstcorp.org",
+        projects=("DM", "RFC"),
     )
 
-    jira_unfurler = factory.get_jira_domain_unfurler()
+
+def test_key_extraction() -> None:
+    """Test that issue keys are extracted from Slack messages."""
     text = "DM-1234 DM-5678\nRFC-1"
-    keys = await jira_unfurler._extract_issues(text)
+    keys = _extract(text)
     assert keys == ["DM-1234", "DM-5678", "RFC-1"]
 
     # Test that URLs are removed, but Jira URLs are preserved
@@ -27,17 +35,158 @@ async def test_key_extraction() -> None:
         "DM-1234 https://jira.lsstcorp.org/browse/DM-5678 "
         "https://example.com/RFC-1"
     )
-    keys = await jira_unfurler._extract_issues(text)
+    keys = _extract(text)
     assert keys == ["DM-1234", "DM-5678"]
 
     # Test that code blocks are removed
     text = "DM-1234\n```DM-5678```\n\n`RFC-1`"
-    keys = await jira_unfurler._extract_issues(text)
+    keys = _extract(text)
     assert keys == ["DM-1234"]
 
+    # Test that fenced code is removed before inline code, so that a stray
+    # backtick doesn't pair with the start of a fence
+    text = "Fixed DM-13 (the ` quote) ```\nDM-6 log\n```"
+    keys = _extract(text)
+    assert keys == ["DM-13"]
+
+    text = "try `x ```DM-7``` DM-8"
+    keys = _extract(text)
+    assert keys == ["DM-8"]
+
     # Test that prefixes cause the tickets to not be recognized.
     text = "Some discussion LDM-1234 other stuff DM-5678 blah"
-    keys = await jira_unfurler._extract_issues(text)
+    keys = _extract(text)
     assert keys == ["DM-5678"]
 
-    await process_contact.aclose()
+
+def _read_issue(key: str) -> JiraIssueSummary:
+    """Parse an issue in the storage test data into a JiraIssueSummary."""
+    path = Path(__file__).parent.parent / "storage" / "data" / f"{key}.json"
+    return JiraIssueSummary.from_json(json.loads(path.read_bytes()))
+
+
+async def _format(
+    issue: JiraIssueSummary, thread_ts: str | None = None
+) -> dict[str, Any]:
+    """Format the Slack payload of an unfurl of a Jira issue."""
+    async with AsyncClient() as http_client:
+        unfurler = JiraUnfurler(
+            jira_client=JiraIssueClient(
+                proxy_url="https://example.com/jira-data-proxy",
+                http_client=http_client,
+                token="gt-1234",
+                max_concurrency=1,
+            ),
+            http_client=http_client,
+            logger=get_logger("unfurlbot"),
+            # The Redis client connects lazily, so it's never used here
+            unfurl_event_store=SlackUnfurlEventStore(redis=Redis()),
+        )
+        message = unfurler._format_slack_message(
+            issue=issue, channel="C123", thread_ts=thread_ts
+        )
+    return message.to_slack()
+
+
+@pytest.mark.asyncio
+async def test_format_resolved_issue() -> None:
+    """Test the unfurl of a resolved issue, which shows the resolved date."""
+    payload = await _format(_read_issue("DM-42711"), thread_ts="1.2")
+    assert payload == {
+        "text": (
+            "DM-42711 (Done) Technote: Wrap code samples that don't have "
+            "captions"
+        ),
+        "mrkdwn": True,
+        "blocks": [
+            {
+                "type": "section",
+                "text": {
+                    "type": "mrkdwn",
+                    "text": (
+                        "<https://jira.lsstcorp.org/browse/DM-42711"
+                        "|*DM-42711*> Technote: Wrap code samples that "
+                        "don't have captions"
+                    ),
+                    "verbatim": False,
+                },
+            },
+            {
+                "type": "context",
+                "elements": [
+                    {
+                        "type": "mrkdwn",
+                        "text": (
+                            "Jonathan Sick | Done | <!date^1706656271"
+                            "^Resolved {date_pretty} {time}"
+                            "|Resolved 2024-01-30>"
+                        ),
+                        "verbatim": False,
+                    }
+                ],
+            },
+        ],
+        "thread_ts": "1.2",
+        "channel": "C123",
+    }
+
+
+@pytest.mark.asyncio
+async def test_format_unresolved_issue() -> None:
+    """Test the unfurl of an unresolved issue, which shows the created date."""
+    payload = await _format(_read_issue("DM-42877"))
+    assert payload == {
+        "text": (
+            "DM-42877 (In Progress) unfurlbot: Create a ticket/identifier "
+            "unfurler for squarebot/Slack"
+        ),
+        "mrkdwn": True,
+        "blocks": [
+            {
+                "type": "section",
+                "text": {
+                    "type": "mrkdwn",
+                    "text": (
+                        "<https://jira.lsstcorp.org/browse/DM-42877"
+                        "|*DM-42877*> unfurlbot: Create a ticket/identifier "
+                        "unfurler for squarebot/Slack"
+                    ),
+                    "verbatim": False,
+                },
+            },
+            {
+                "type": "context",
+                "elements": [
+                    {
+                        "type": "mrkdwn",
+                        "text": (
+                            "Jonathan Sick | In Progress | <!date^1707841386"
+                            "^Created {date_pretty} {time}"
+                            "|Created 2024-02-13>"
+                        ),
+                        "verbatim": False,
+                    }
+                ],
+            },
+        ],
+        "channel": "C123",
+    }
+
+
+@pytest.mark.asyncio
+async def test_format_fallback_text() -> None:
+    """Test that the fallback text is escaped and truncated for Slack."""
+    issue = _read_issue("DM-42711")
+
+    # Long text is truncated at the last newline that fits
+    summary = "Fix <this> & that\n" + "x" * 3000
+    payload = await _format(issue.model_copy(update={"summary": summary}))
+    assert (
+        payload["text"] == "DM-42711 (Done) Fix &lt;this&gt; &amp; that [...]"
+    )
+
+    # Without a newline, it's truncated at the limit
+    summary = "x" * 3000
+    payload = await _format(issue.model_copy(update={"summary": summary}))
+    assert payload["text"] == ("DM-42711 (Done) " + "x" * 2978 + " [...]")
+    assert len(payload["text"]) == 3000
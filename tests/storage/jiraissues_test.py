@@ -3,77 +3,146 @@
 from __future__ import annotations
 
 import json
+from datetime import UTC, datetime
+from functools import cache
 from pathlib import Path
 
-from unfurlbot.storage.jiraissues import JiraIssueSummary
+import pytest
+from httpx import AsyncClient, MockTransport, Request, Response
 
+from unfurlbot.storage.jiraissues import JiraIssueClient, JiraIssueSummary
 
-def test_parsing_dm_42877() -> None:
-    """Test that the DM-42877 issue can be parsed into a JiraIssueSummary."""
-    p = Path(__file__).parent / "data" / "DM-42877.json"
-    issue = JiraIssueSummary.from_json(json.loads(p.read_text()))
 
-    assert issue.key == "DM-42877"
-    assert issue.summary == (
-        "unfurlbot: Create a ticket/identifier unfurler for squarebot/Slack"
-    )
-    assert issue.status_label == "In Progress"
-    assert issue.date_created.isoformat() == "2024-02-13T16:23:06+00:00"
-    assert issue.description is not None
-    assert issue.description.startswith(
-        "This backend for Squarebot will replace",
-    )
-    assert issue.reporter_name == "Jonathan Sick"
-    assert issue.assignee_name == "Jonathan Sick"
-    assert issue.date_resolved is None
-    assert issue.homepage == "https://jira.lsstcorp.org/browse/DM-42877"
-
-
-def test_parsing_dm_42711() -> None:
-    """Test parsing DM-42711 into a JiraIssueSummary."""
-    p = Path(__file__).parent / "data" / "DM-42711.json"
-    issue = JiraIssueSummary.from_json(json.loads(p.read_text()))
-    assert issue.key == "DM-42711"
-    assert issue.summary == (
-        "Technote: Wrap code samples that don't have captions"
-    )
-    assert issue.status_label == "Done"
-    assert issue.date_created.isoformat() == "2024-01-29T23:08:48+00:00"
-    assert issue.reporter_name == "Jonathan Sick"
-    assert issue.assignee_name == "Jonathan Sick"
-    assert issue.date_resolved is not None
-    assert issue.date_resolved.isoformat() == "2024-01-30T23:11:11+00:00"
-    assert issue.homepage == "https://jira.lsstcorp.org/browse/DM-42711"
-
-
-def test_parsing_rfc_880() -> None:
-    """Test parsing RFC-880 into a JiraIssueSummary."""
-    p = Path(__file__).parent / "data" / "RFC-880.json"
-    issue = JiraIssueSummary.from_json(json.loads(p.read_text()))
-    assert issue.key == "RFC-880"
-    assert (
-        issue.summary == "Allow package docstrings in python automodapi docs."
-    )
-    assert issue.status_label == "Withdrawn"
-    assert issue.date_created.isoformat() == "2022-09-23T21:50:08+00:00"
-    assert issue.reporter_name == "John Parejko"
-    assert issue.assignee_name == "John Parejko"
-    assert issue.date_resolved is not None
-    assert issue.date_resolved.isoformat() == "2024-01-31T23:21:23+00:00"
-    assert issue.homepage == "https://jira.lsstcorp.org/browse/RFC-880"
-
-
-def test_parsing_dm_37782() -> None:
-    """Test parsing DM-37782 (an epic) into a JiraIssueSummary."""
-    p = Path(__file__).parent / "data" / "DM-37782.json"
-    issue = JiraIssueSummary.from_json(json.loads(p.read_text()))
-    assert issue.key == "DM-37782"
-    assert issue.summary == (
-        "Documentation services and front end development and support"
+def _read_issue_data(key: str) -> bytes:
+    """Read the Jira API response for an issue from the test data."""
+    return (Path(__file__).parent / "data" / f"{key}.json").read_bytes()
+
+
+@cache
+def _parse_issue(key: str) -> JiraIssueSummary:
+    """Parse an issue in the test data into a JiraIssueSummary.
+
+    The summary is immutable, so each issue is only parsed once and shared
+    between tests.
+    """
+    return JiraIssueSummary.from_json(json.loads(_read_issue_data(key)))
+
+
+@pytest.mark.parametrize(
+    ("expected", "description_start"),
+    [
+        (
+            JiraIssueSummary(
+                key="DM-42877",
+                summary=(
+                    "unfurlbot: Create a ticket/identifier unfurler for "
+                    "squarebot/Slack"
+                ),
+                status_label="In Progress",
+                date_created=datetime(2024, 2, 13, 16, 23, 6, tzinfo=UTC),
+                reporter_name="Jonathan Sick",
+                homepage="https://jira.lsstcorp.org/browse/DM-42877",
+                date_resolved=None,
+                assignee_name="Jonathan Sick",
+                description=None,
+            ),
+            "This backend for Squarebot will replace",
+        ),
+        (
+            JiraIssueSummary(
+                key="DM-42711",
+                summary=(
+                    "Technote: Wrap code samples that don't have captions"
+                ),
+                status_label="Done",
+                date_created=datetime(2024, 1, 29, 23, 8, 48, tzinfo=UTC),
+                reporter_name="Jonathan Sick",
+                homepage="https://jira.lsstcorp.org/browse/DM-42711",
+                date_resolved=datetime(2024, 1, 30, 23, 11, 11, tzinfo=UTC),
+                assignee_name="Jonathan Sick",
+                description=None,
+            ),
+            "Right now only code samples",
+        ),
+        (
+            JiraIssueSummary(
+                key="RFC-880",
+                summary=(
+                    "Allow package docstrings in python automodapi docs."
+                ),
+                status_label="Withdrawn",
+                date_created=datetime(2022, 9, 23, 21, 50, 8, tzinfo=UTC),
+                reporter_name="John Parejko",
+                homepage="https://jira.lsstcorp.org/browse/RFC-880",
+                date_resolved=datetime(2024, 1, 31, 23, 21, 23, tzinfo=UTC),
+                assignee_name="John Parejko",
+                description=None,
+            ),
+            "In the dev guide",
+        ),
+        (
+            # An epic
+            JiraIssueSummary(
+                key="DM-37782",
+                summary=(
+                    "Documentation services and front end development and "
+                    "support"
+                ),
+                status_label="In Progress",
+                date_created=datetime(2023, 1, 30, 21, 20, 55, tzinfo=UTC),
+                reporter_name="frossie",
+                homepage="https://jira.lsstcorp.org/browse/DM-37782",
+                date_resolved=None,
+                assignee_name="Jonathan Sick",
+                description=None,
+            ),
+            None,
+        ),
+    ],
+    ids=["DM-42877", "DM-42711", "RFC-880", "DM-37782"],
+)
+def test_parsing(
+    expected: JiraIssueSummary, description_start: str | None
+) -> None:
+    """Test parsing Jira issues into a JiraIssueSummary."""
+    issue = _parse_issue(expected.key)
+    # Descriptions are long, so only their start is compared
+    assert issue.model_copy(update={"description": None}) == expected
+    if description_start is None:
+        assert issue.description is None
+    else:
+        assert issue.description is not None
+        assert issue.description.startswith(description_start)
+
+
+@pytest.mark.asyncio
+async def test_get_issue() -> None:
+    """Test that the client requests only the fields used by the summary, and
+    reuses the parsed summary while the issue is unchanged.
+    """
+    data = _read_issue_data("DM-42877")
+    requests: list[Request] = []
+
+    def handler(request: Request) -> Response:
+        requests.append(request)
+        return Response(200, content=data)
+
+    async with AsyncClient(transport=MockTransport(handler)) as http_client:
+        jira_client = JiraIssueClient(
+            proxy_url="https://example.com/jira-data-proxy",
+            http_client=http_client,
+            token="gt-1234",
+            max_concurrency=1,
+        )
+        issue = await jira_client.get_issue("DM-42877")
+        assert issue.key == "DM-42877"
+        assert await jira_client.get_issue("DM-42877") is issue
+
+    assert len(requests) == 2
+    assert requests[0].url.path == (
+        "/jira-data-proxy/rest/api/2/issue/DM-42877"
     )
-    assert issue.status_label == "In Progress"
-    assert issue.date_created.isoformat() == "2023-01-30T21:20:55+00:00"
-    assert issue.assignee_name == "Jonathan Sick"
-    assert issue.reporter_name == "frossie"
-    assert issue.date_resolved is None
-    assert issue.homepage == "https://jira.lsstcorp.org/browse/DM-37782"
+    fields = requests[0].url.params["fields"].split(",")
+    assert "summary" in fields
+    assert "comment" not in fields
+    assert requests[0].headers["Authorization"] == "Bearer gt-1234"
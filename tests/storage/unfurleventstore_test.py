@@ -0,0 +1,133 @@
+"""Tests for the Slack unfurl event store."""
+
+from __future__ import annotations
+
+from types import TracebackType
+from typing import Any, Self, cast
+
+import pytest
+from redis.asyncio import Redis
+
+from unfurlbot.storage.unfurleventstore import (
+    SlackUnfurlEventStore,
+    _format_event_key,
+)
+
+
+class MockPipeline:
+    """Redis pipeline stub that records the keys checked with EXISTS."""
+
+    def __init__(self, redis: MockRedis, *, transaction: bool) -> None:
+        self.redis = redis
+        self.transaction = transaction
+        self.keys: list[str] = []
+        self.executed = False
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        pass
+
+    def exists(self, key: str) -> Self:
+        self.keys.append(key)
+        return self
+
+    async def execute(self) -> list[int]:
+        self.executed = True
+        return [int(key in self.redis.data) for key in self.keys]
+
+
+class MockRedis:
+    """Redis client stub that keeps values in memory."""
+
+    def __init__(self) -> None:
+        self.data: dict[str, Any] = {}
+        self.pipelines: list[MockPipeline] = []
+
+    async def set(self, key: str, value: Any, ex: Any = None) -> None:
+        self.data[key] = value
+
+    def pipeline(self, *, transaction: bool = True) -> MockPipeline:
+        pipeline = MockPipeline(self, transaction=transaction)
+        self.pipelines.append(pipeline)
+        return pipeline
+
+
+@pytest.mark.parametrize(
+    ("token", "thread_ts", "expected"),
+    [
+        ("DM-1", None, "unfurl:slack:C123:DM-1"),
+        (
+            "DM-1",
+            "1700000000.000100",
+            "unfurl:slack:C123:DM-1:1700000000.000100",
+        ),
+        ("RFC880", None, "unfurl:slack:C123:RFC880"),
+        ("DMTN-é", None, "unfurl:slack:C123:%444d544e2dc3a9"),
+        ("a b", None, "unfurl:slack:C123:%612062"),
+        ("a:b", "1.2", "unfurl:slack:C123:%613a62:1.2"),
+        ("", None, "unfurl:slack:C123:%"),
+    ],
+    ids=[
+        "jira-key",
+        "jira-key-thread",
+        "alphanumeric",
+        "non-ascii",
+        "space",
+        "colon-thread",
+        "empty",
+    ],
+)
+def test_format_event_key(
+    token: str, thread_ts: str | None, expected: str
+) -> None:
+    """Test that safe tokens are used as-is and others are hex encoded."""
+    assert _format_event_key("C123", token, thread_ts) == expected
+
+
+def test_format_event_key_no_collision() -> None:
+    """Test that a hex encoded token can't collide with a raw token."""
+    # "20" is the hex encoding of " "
+    assert _format_event_key("C123", "20", None) != _format_event_key(
+        "C123", " ", None
+    )
+
+
+@pytest.mark.asyncio
+async def test_has_events() -> None:
+    """Test that events added to the store are found with a single pipeline
+    of prefixed keys, and that the results are in token order.
+    """
+    redis = MockRedis()
+    store = SlackUnfurlEventStore(cast("Redis", redis), key_prefix="test:")
+    await store.add_event("C123", "DM-2")
+    await store.add_event("C123", "DM-3", thread_ts="1.2")
+    assert set(redis.data) == {
+        "test:unfurl:slack:C123:DM-2",
+        "test:unfurl:slack:C123:DM-3:1.2",
+    }
+
+    results = await store.has_events("C123", ["DM-3", "DM-2", "DM-1"])
+    assert list(results.items()) == [
+        ("DM-3", False),
+        ("DM-2", True),
+        ("DM-1", False),
+    ]
+    assert len(redis.pipelines) == 1
+    pipeline = redis.pipelines[0]
+    assert not pipeline.transaction
+    assert pipeline.executed
+    assert pipeline.keys == [
+        "test:unfurl:slack:C123:DM-3",
+        "test:unfurl:slack:C123:DM-2",
+        "test:unfurl:slack:C123:DM-1",
+    ]
+
+    results = await store.has_events("C123", ["DM-2", "DM-3"], thread_ts="1.2")
+    assert list(results.items()) == [("DM-2", False), ("DM-3", True)]